@@ -1,24 +1,55 @@
 from __future__ import annotations
 
 from datetime import timedelta
+import ipaddress
 import logging
 
+import voluptuous as vol
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_PASSWORD, CONF_HOST, Platform
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryNotReady, ConfigEntryAuthFailed
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import (
+    ConfigEntryNotReady,
+    ConfigEntryAuthFailed,
+    HomeAssistantError,
+)
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.device_registry import format_mac
 
 from .api import WAX204Api, WAX204ApiError, WAX204ApiInvalidPasswordError
-from .const import DOMAIN
+from .const import (
+    ATTR_CYCLES,
+    CONF_SYSLOG_ENABLED,
+    CONF_SYSLOG_PORT,
+    DEFAULT_PROFILE_CYCLES,
+    DEFAULT_SYSLOG_PORT,
+    DOMAIN,
+    SERVICE_PROFILE,
+)
 from .coordinator import Wax204DataUpdateCoordinator
+from .profiler import CoordinatorProfiler
+from .syslog_listener import SyslogServer
 
 PLATFORMS: list[Platform] = [Platform.DEVICE_TRACKER]
 SCAN_INTERVAL = timedelta(seconds=5)
+# Polling only reconciles missed syslog messages, so it can be much slower.
+# Must stay below CONSIDER_HOME or devices would be marked away between polls.
+SYSLOG_SCAN_INTERVAL = timedelta(seconds=30)
 COOKIE_REFRESH_INTERVAL = timedelta(hours=2)
 CONSIDER_HOME = timedelta(seconds=60)
 
 _LOGGER = logging.getLogger(__name__)
 
+PROFILE_SERVICE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CYCLES, default=DEFAULT_PROFILE_CYCLES): vol.All(
+            cv.positive_int, vol.Range(min=1, max=100)
+        ),
+    }
+)
+
 
 # https://developers.home-assistant.io/docs/config_entries_index/#setting-up-an-entry
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -53,10 +84,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         raise ConfigEntryNotReady(
             f"Failed to connect to WAX204 router at {host}") from e
 
+    syslog_enabled = entry.options.get(CONF_SYSLOG_ENABLED, False)
     coordinator = Wax204DataUpdateCoordinator(
         hass,
         api=api,
-        update_interval=SCAN_INTERVAL,
+        update_interval=SYSLOG_SCAN_INTERVAL if syslog_enabled else SCAN_INTERVAL,
         cookie_refresh_interval=COOKIE_REFRESH_INTERVAL,
         consider_home=CONSIDER_HOME,
         password=password,
@@ -67,12 +99,19 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         "api": api,
         "update_listener": entry.add_update_listener(update_listener),
         "coordinator": coordinator,
+        "syslog_server": None,
     }
 
     # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
     await coordinator.async_config_entry_first_refresh()
 
+    if syslog_enabled:
+        hass.data[DOMAIN][entry.entry_id]["syslog_server"] = await _async_start_syslog_server(
+            hass, entry, host, coordinator)
+
+    await _async_migrate_unique_ids(hass, entry)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    _async_register_services(hass)
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     return True
@@ -86,9 +125,117 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         entry_data = hass.data[DOMAIN].pop(entry.entry_id)
         entry_data["update_listener"]()  # Remove the update listener
 
+        # async_reload_entry unloads directly, so entry.async_on_unload isn't enough
+        if entry_data["syslog_server"] is not None:
+            await entry_data["syslog_server"].async_stop()
+
+        coordinator: Wax204DataUpdateCoordinator = entry_data["coordinator"]
+        if coordinator.profiler is not None:
+            coordinator.profiler.remove_source(coordinator.api.host)
+            coordinator.profiler = None
+
+        if not hass.data[DOMAIN]:
+            hass.services.async_remove(DOMAIN, SERVICE_PROFILE)
+
     return unload_ok
 
 
+async def _async_migrate_unique_ids(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Normalize entity unique ids (macs) with format_mac, as the api now does."""
+    entity_registry = er.async_get(hass)
+
+    @callback
+    def migrate(entity_entry: er.RegistryEntry) -> dict[str, str] | None:
+        new_unique_id = format_mac(entity_entry.unique_id)
+        if new_unique_id == entity_entry.unique_id:
+            return None
+        if entity_registry.async_get_entity_id(
+            entity_entry.domain, DOMAIN, new_unique_id
+        ):
+            _LOGGER.warning(
+                "Can't migrate %s, an entity for %s already exists",
+                entity_entry.entity_id, new_unique_id)
+            return None
+        return {"new_unique_id": new_unique_id}
+
+    await er.async_migrate_entries(hass, entry.entry_id, migrate)
+
+
+async def _async_start_syslog_server(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    host: str,
+    coordinator: Wax204DataUpdateCoordinator,
+) -> SyslogServer | None:
+    """Listen for the router's syslog. Falls back to fast polling on failure."""
+    try:
+        allowed_hosts = await _async_resolve_host(hass, host)
+    except OSError:
+        _LOGGER.exception(
+            "Failed to resolve %s, can't check where syslog messages come from. "
+            "Polling every %s instead", host, SCAN_INTERVAL)
+        coordinator.update_interval = SCAN_INTERVAL
+        return None
+
+    port = entry.options.get(CONF_SYSLOG_PORT, DEFAULT_SYSLOG_PORT)
+    server = SyslogServer(
+        port, coordinator.async_handle_presence_event, allowed_hosts=allowed_hosts)
+    try:
+        await server.async_start()
+    except OSError:
+        _LOGGER.exception(
+            "Failed to listen for syslog messages on port %s. Polling every %s instead",
+            port, SCAN_INTERVAL)
+        coordinator.update_interval = SCAN_INTERVAL
+        return None
+    # Also stops the server if setting up the rest of the entry fails
+    entry.async_on_unload(server.async_stop)
+    return server
+
+
+async def _async_resolve_host(hass: HomeAssistant, host: str) -> set[str]:
+    """Return the addresses the router can send syslog messages from.
+
+    DNS names are resolved once, reload the entry if the router's address changes.
+    """
+    try:
+        ipaddress.ip_address(host)
+        return {host}
+    except ValueError:
+        pass
+    infos = await hass.loop.getaddrinfo(host, None)
+    return {info[4][0] for info in infos}
+
+
+def _async_register_services(hass: HomeAssistant) -> None:
+    if hass.services.has_service(DOMAIN, SERVICE_PROFILE):
+        return
+
+    async def async_profile(call: ServiceCall) -> None:
+        """Profile the next update cycles of every router."""
+        coordinators: list[Wax204DataUpdateCoordinator] = [
+            entry_data["coordinator"] for entry_data in hass.data[DOMAIN].values()
+        ]
+        if any(c.profiler is not None for c in coordinators):
+            raise HomeAssistantError("Profiling is already in progress")
+
+        def on_finished() -> None:
+            for c in coordinators:
+                if c.profiler is profiler:
+                    c.profiler = None
+
+        profiler = CoordinatorProfiler(
+            hass, call.data[ATTR_CYCLES], on_finished=on_finished)
+        for c in coordinators:
+            profiler.add_source(c.api.host)
+            c.profiler = profiler
+        _LOGGER.info("Profiling the next %s update cycles",
+                     call.data[ATTR_CYCLES])
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE, async_profile, schema=PROFILE_SERVICE_SCHEMA)
+
+
 async def update_listener(hass: HomeAssistant, entry: ConfigEntry):
     """Handle options update."""
     await hass.config_entries.async_reload(entry.entry_id)
@@ -7,6 +7,7 @@ import orjson
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.device_registry import format_mac
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -36,13 +37,7 @@ class WAX204Api:
 
     async def is_wax_router(self):
         try:
-            async with self._session.get(
-                f"{self.host}/day_after_login.html"
-            ) as response:
-                if response.status != 200:
-                    return False
-                text = await response.text()
-                return "NETGEAR WAX204" in text
+            return await probe_wax_router(self._session, self.host)
         except aiohttp.ClientError as e:
             _LOGGER.warning(
                 "Request failed when checking if router is WAX204", exc_info=True
@@ -97,6 +92,10 @@ class WAX204Api:
             raise WAX204ApiError("Invalid json when signing in") from e
 
     async def get_connected_devices(self):
+        return parse_connected_devices(await self.fetch_connected_devices())
+
+    async def fetch_connected_devices(self) -> str:
+        """Fetch the raw connected devices json from the router."""
         timestamp_ms = int(datetime.datetime.now().timestamp() * 1000)
         try:
             async with self._session.get(f"{self.host}/refresh_dev.htm", params={"ts": timestamp_ms}) as response:
@@ -105,22 +104,9 @@ class WAX204Api:
                     raise WAX204ApiExpireCookieError(
                         "Auth cookie expired. Sign in again."
                     )
-                json_response = await response.json(content_type=None)
-                json_devices = json_response.get("devices", [])
-                devices = []
-                for d in json_devices:
-                    devices.append(
-                        ConnectedDevice(
-                            hostname=d.get("deviceName"),
-                            ip=d.get("ip"),
-                            mac=d.get("mac"),
-                        )
-                    )
-                return devices
+                return await response.text()
         except aiohttp.ClientError as e:
             raise WAX204ApiError("Error getting connected devices") from e
-        except orjson.JSONDecodeError as e:
-            raise WAX204ApiError("Invalid json when getting connected devices") from e
 
     async def _is_signed_out(self, response: aiohttp.ClientResponse) -> bool:
         if response.status != 200:
@@ -129,6 +115,39 @@ class WAX204Api:
         return "day_after_login.html" in text and "top.location.href=" in text
 
 
+async def probe_wax_router(session: aiohttp.ClientSession, base_url: str) -> bool:
+    """Check if base_url serves the WAX204 web UI.
+
+    Raises aiohttp.ClientError if the request fails.
+    """
+    async with session.get(f"{base_url}/day_after_login.html") as response:
+        if response.status != 200:
+            return False
+        text = await response.text()
+        return "NETGEAR WAX204" in text
+
+
+def parse_connected_devices(text: str) -> list[ConnectedDevice]:
+    """Parse the json returned by `WAX204Api.fetch_connected_devices`."""
+    try:
+        json_response = orjson.loads(text)
+    except orjson.JSONDecodeError as e:
+        raise WAX204ApiError("Invalid json when getting connected devices") from e
+
+    json_devices = json_response.get("devices", [])
+    devices = []
+    for d in json_devices:
+        mac = d.get("mac")
+        devices.append(
+            ConnectedDevice(
+                hostname=d.get("deviceName"),
+                ip=d.get("ip"),
+                mac=format_mac(mac) if mac else mac,
+            )
+        )
+    return devices
+
+
 class WAX204ApiError(Exception):
     """WAX204 API error."""
 
@@ -1,6 +1,7 @@
 """Config flow for Netgear WAX204 Router integration."""
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
@@ -11,6 +12,11 @@ from homeassistant.const import CONF_HOST, CONF_PASSWORD
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.selector import (
+    SelectSelector,
+    SelectSelectorConfig,
+    SelectSelectorMode,
+)
 
 from .api import (
     WAX204Api,
@@ -19,22 +25,48 @@ from .api import (
     WAX204ApiInvalidPasswordError,
     WAX204ApiLoginError,
 )
-from .const import DOMAIN
+from .const import (
+    CONF_REGISTRATION_BATCH_SIZE,
+    CONF_SYSLOG_ENABLED,
+    CONF_SYSLOG_PORT,
+    DEFAULT_REGISTRATION_BATCH_SIZE,
+    DEFAULT_SYSLOG_PORT,
+    DOMAIN,
+)
+from .discovery import async_discover_routers
 
 _LOGGER = logging.getLogger(__name__)
 
-STEP_USER_DATA_SCHEMA = vol.Schema(
+DEFAULT_HOST = "192.168.1.1"
+
+STEP_HOST_DATA_SCHEMA = vol.Schema(
     {
-        vol.Required(CONF_HOST, default="192.168.1.1"): str,
+        vol.Required(CONF_HOST, default=DEFAULT_HOST): str,
         vol.Required(CONF_PASSWORD): str,
     }
 )
 
 
+def discovered_host_data_schema(hosts: list[str]) -> vol.Schema:
+    """Let the user pick one of the discovered routers, or type another host."""
+    return vol.Schema(
+        {
+            vol.Required(CONF_HOST, default=hosts[0]): SelectSelector(
+                SelectSelectorConfig(
+                    options=hosts,
+                    custom_value=True,
+                    mode=SelectSelectorMode.DROPDOWN,
+                )
+            ),
+            vol.Required(CONF_PASSWORD): str,
+        }
+    )
+
+
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
     """Validate the user input allows us to connect.
 
-    Data has the keys from STEP_USER_DATA_SCHEMA with values provided by the user.
+    Data has the keys from STEP_HOST_DATA_SCHEMA with values provided by the user.
     """
     host = data[CONF_HOST]
     password = data[CONF_PASSWORD]
@@ -65,10 +97,39 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
     CONNECTION_CLASS = config_entries.CONN_CLASS_LOCAL_POLL
 
+    def __init__(self) -> None:
+        self._discovery_task: asyncio.Task[list[str]] | None = None
+        self._discovered_hosts: list[str] = []
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Handle the initial step."""
+        return self.async_show_menu(
+            step_id="user", menu_options=["discovery", "host"])
+
+    async def async_step_discovery(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Search the local subnets for routers in the background."""
+        if self._discovery_task is None:
+            self._discovery_task = self.hass.async_create_task(
+                self._async_discover_new_hosts())
+
+        if not self._discovery_task.done():
+            return self.async_show_progress(
+                step_id="discovery",
+                progress_action="discovery",
+                progress_task=self._discovery_task,
+            )
+
+        self._discovered_hosts = self._discovery_task.result()
+        return self.async_show_progress_done(next_step_id="host")
+
+    async def async_step_host(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Ask for the host and password."""
         errors: dict[str, str] = {}
         if user_input is not None:
             try:
@@ -81,11 +142,30 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             except Exception:  # pylint: disable=broad-except
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
+        elif self._discovery_task is not None and not self._discovered_hosts:
+            errors["base"] = "no_routers_found"
+
+        data_schema = STEP_HOST_DATA_SCHEMA
+        if self._discovered_hosts:
+            data_schema = discovered_host_data_schema(self._discovered_hosts)
 
         return self.async_show_form(
-            step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
+            step_id="host", data_schema=data_schema, errors=errors
         )
 
+    async def _async_discover_new_hosts(self) -> list[str]:
+        """Discover routers on the local subnets that aren't configured yet."""
+        try:
+            hosts = await async_discover_routers(self.hass)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Unexpected exception discovering routers")
+            return []
+
+        configured_hosts = {
+            entry.data.get(CONF_HOST) for entry in self._async_current_entries()
+        }
+        return [host for host in hosts if host not in configured_hosts]
+
     @staticmethod
     @callback
     def async_get_options_flow(
@@ -112,6 +192,21 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                     CONF_PASSWORD, default=self.config_entry.data.get(
                         CONF_PASSWORD)
                 ): str,
+                vol.Required(
+                    CONF_REGISTRATION_BATCH_SIZE,
+                    default=self.config_entry.options.get(
+                        CONF_REGISTRATION_BATCH_SIZE, DEFAULT_REGISTRATION_BATCH_SIZE)
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Required(
+                    CONF_SYSLOG_ENABLED,
+                    default=self.config_entry.options.get(
+                        CONF_SYSLOG_ENABLED, False)
+                ): bool,
+                vol.Required(
+                    CONF_SYSLOG_PORT,
+                    default=self.config_entry.options.get(
+                        CONF_SYSLOG_PORT, DEFAULT_SYSLOG_PORT)
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=65535)),
             }
         )
 
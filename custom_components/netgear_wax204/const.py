@@ -6,3 +6,14 @@ LOGGER: Logger = getLogger(__package__)
 NAME = "Netgear WAX204"
 DOMAIN = "netgear_wax204"
 VERSION = "1.4.0"
+
+SERVICE_PROFILE = "profile"
+ATTR_CYCLES = "cycles"
+DEFAULT_PROFILE_CYCLES = 5
+
+CONF_REGISTRATION_BATCH_SIZE = "registration_batch_size"
+DEFAULT_REGISTRATION_BATCH_SIZE = 50
+
+CONF_SYSLOG_ENABLED = "syslog_enabled"
+CONF_SYSLOG_PORT = "syslog_port"
+DEFAULT_SYSLOG_PORT = 5514
@@ -1,10 +1,11 @@
 """DataUpdateCoordinator for integration_blueprint."""
 from __future__ import annotations
 
+from contextlib import AbstractContextManager, nullcontext
 from datetime import datetime, timedelta
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
@@ -18,9 +19,23 @@ from .api import (
     WAX204ApiLoginError,
     WAX204ApiConcurrentUsersError,
     WAX204ApiInvalidPasswordError,
-    WAX204ApiExpireCookieError
+    WAX204ApiExpireCookieError,
+    parse_connected_devices,
 )
 from .const import DOMAIN, LOGGER
+from .profiler import (
+    STAGE_DISPATCH,
+    STAGE_HTTP,
+    STAGE_MODEL,
+    STAGE_PARSE,
+    CoordinatorProfiler,
+)
+from .syslog_listener import PresenceEvent
+
+# When a device roams between the router's radios, the association on the new
+# radio is often logged before the disassociation from the old one. Ignore
+# disconnects this soon after a connect.
+ROAMING_GRACE_PERIOD = timedelta(seconds=10)
 
 
 # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
@@ -48,6 +63,10 @@ class Wax204DataUpdateCoordinator(DataUpdateCoordinator):
         self.pause_interval = timedelta(minutes=10)
         self._consider_home = consider_home
         self._last_seen: dict[str, datetime] = {}
+        self._last_connect_event: dict[str, datetime] = {}
+        # Macs seen for the first time during the latest update
+        self.joined_macs: set[str] = set()
+        self.profiler: CoordinatorProfiler | None = None
         super().__init__(
             hass=hass,
             logger=LOGGER,
@@ -66,8 +85,34 @@ class Wax204DataUpdateCoordinator(DataUpdateCoordinator):
     def _update_last_seen(self, devices: list[ConnectedDevice]):
         now = datetime.now()
         for d in devices:
+            if d.mac not in self._last_seen:
+                self.joined_macs.add(d.mac)
             self._last_seen[d.mac] = now
 
+    @callback
+    def async_handle_presence_event(self, event: PresenceEvent) -> None:
+        """Update presence right away from a pushed (syslog) event."""
+        if event.mac not in self._last_seen:
+            if event.connected:
+                # Let a poll register new devices, the log line lacks their details
+                self.hass.async_create_task(self.async_request_refresh())
+            return
+
+        now = datetime.now()
+        if event.connected:
+            self._last_seen[event.mac] = now
+            self._last_connect_event[event.mac] = now
+        else:
+            last_connect = self._last_connect_event.get(event.mac)
+            if last_connect is not None and now - last_connect <= ROAMING_GRACE_PERIOD:
+                LOGGER.debug("Ignoring disconnect of %s, it just connected", event.mac)
+                return
+            self._last_seen[event.mac] = datetime.min
+
+        # Skip the async_update_listeners override so pushed events aren't
+        # counted in the profiler's dispatch stage
+        super().async_update_listeners()
+
     async def _refresh_login_cookie(self):
         """Sign out other users and sign in again."""
         LOGGER.info("Refreshing login cookie")
@@ -92,6 +137,19 @@ class Wax204DataUpdateCoordinator(DataUpdateCoordinator):
         except WAX204ApiError as e:
             raise e
 
+    def _stage(self, name: str) -> AbstractContextManager:
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.stage(self.api.host, name)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners."""
+        with self._stage(STAGE_DISPATCH):
+            super().async_update_listeners()
+        if self.profiler is not None:
+            self.profiler.end_cycle(self.api.host)
+
     def _cached_data(self):
         if self.data is None:
             return Wax204DataModel(devices=[])
@@ -99,6 +157,18 @@ class Wax204DataUpdateCoordinator(DataUpdateCoordinator):
 
     async def _async_update_data(self):
         """Update data via API."""
+        profiler = self.profiler
+        if profiler is None:
+            return await self._async_fetch_data()
+
+        profiler.start_cycle(self.api.host)
+        try:
+            return await self._async_fetch_data()
+        finally:
+            profiler.fetch_done(self.api.host)
+
+    async def _async_fetch_data(self):
+        self.joined_macs = set()
         try:
             if self.is_paused:
                 if datetime.now() <= self.resume_after:
@@ -118,10 +188,14 @@ class Wax204DataUpdateCoordinator(DataUpdateCoordinator):
                 await self._refresh_login_cookie()
 
             try:
-                data = await self.api.get_connected_devices()
+                with self._stage(STAGE_HTTP):
+                    text = await self.api.fetch_connected_devices()
+                with self._stage(STAGE_PARSE):
+                    data = parse_connected_devices(text)
                 LOGGER.debug("Found %s connected devices", len(data))
-                self._update_last_seen(data)
-                return Wax204DataModel(devices=data)
+                with self._stage(STAGE_MODEL):
+                    self._update_last_seen(data)
+                    return Wax204DataModel(devices=data)
             except WAX204ApiExpireCookieError:
                 # Login expired. Most likely because another user is logged in.
                 # The router can only support one user at a time.
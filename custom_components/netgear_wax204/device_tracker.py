@@ -1,36 +1,93 @@
 
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+
 from homeassistant.components.device_tracker import ScannerEntity, SourceType
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from custom_components.netgear_wax204.api import ConnectedDevice
 
-from .const import DOMAIN
+from .const import (
+    CONF_REGISTRATION_BATCH_SIZE,
+    DEFAULT_REGISTRATION_BATCH_SIZE,
+    DOMAIN,
+)
 from .coordinator import Wax204DataUpdateCoordinator
 
+# Wait until no new devices arrived for this long before registering them, and
+# between batches so large bursts don't block the event loop
+REGISTRATION_DEBOUNCE = timedelta(seconds=1)
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
     coordinator: Wax204DataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    batch_size: int = entry.options.get(
+        CONF_REGISTRATION_BATCH_SIZE, DEFAULT_REGISTRATION_BATCH_SIZE)
     seen_macs = set()
+    # Devices waiting to be registered, in the order they were found
+    pending: dict[str, ConnectedDevice] = {}
+    cancel_flush: CALLBACK_TYPE | None = None
+
+    @callback
+    def queue_devices(devices: Iterable[ConnectedDevice]) -> None:
+        nonlocal cancel_flush
+        queued = False
+        for device in devices:
+            if device.mac not in seen_macs:
+                pending[device.mac] = device
+                seen_macs.add(device.mac)
+                queued = True
+
+        if not queued:
+            return
+        # Restart the timer while new devices keep arriving
+        if cancel_flush is not None:
+            cancel_flush()
+        cancel_flush = async_call_later(
+            hass, REGISTRATION_DEBOUNCE, flush_pending)
+
+    @callback
+    def flush_pending(_now: datetime) -> None:
+        """Register the next batch of pending devices."""
+        nonlocal cancel_flush
+        cancel_flush = None
+
+        batch = []
+        for mac in list(pending)[:batch_size]:
+            batch.append(NetgearWax204DeviceEntity(
+                coordinator, pending.pop(mac)))
+        async_add_entities(batch)
+
+        if pending:
+            cancel_flush = async_call_later(
+                hass, REGISTRATION_DEBOUNCE, flush_pending)
 
     @callback
     def on_coordinator_update() -> None:
         if not coordinator.data:
             return
 
-        new_entities = []
-        for mac, device in coordinator.data.devices.items():
-            if mac not in seen_macs:
-                new_entities.append(
-                    NetgearWax204DeviceEntity(coordinator, device))
-                seen_macs.add(mac)
+        devices = coordinator.data.devices
+        queue_devices(devices[mac]
+                      for mac in coordinator.joined_macs if mac in devices)
+
+    @callback
+    def cancel_pending() -> None:
+        if cancel_flush is not None:
+            cancel_flush()
 
-        async_add_entities(new_entities)
+    # The first refresh happened before this platform was set up, so its devices
+    # were never announced as joins
+    if coordinator.data:
+        queue_devices(coordinator.data.devices.values())
 
     entry.async_on_unload(
         coordinator.async_add_listener(on_coordinator_update))
+    entry.async_on_unload(cancel_pending)
 
 
 class NetgearWax204DeviceEntity(CoordinatorEntity, ScannerEntity):
@@ -0,0 +1,111 @@
+"""Discover WAX204 routers on the local subnets."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+import ipaddress
+
+import aiohttp
+
+from homeassistant.components import network
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .api import probe_wax_router
+from .const import LOGGER
+
+# Never scan more than a /24 per interface address, larger subnets take too long
+MIN_PREFIX = 24
+PROBE_CONCURRENCY = 64
+PROBE_TIMEOUT = 1.0
+# The deadline grows with the number of subnets, up to MAX_DISCOVERY_TIMEOUT
+DISCOVERY_TIMEOUT_PER_SUBNET = 8.0
+MAX_DISCOVERY_TIMEOUT = 30.0
+
+
+async def async_discover_routers(hass: HomeAssistant) -> list[str]:
+    """Return the ip addresses of WAX204 routers on the local subnets."""
+    adapters = await network.async_get_adapters(hass)
+    interfaces = [
+        (ip_info["address"], ip_info["network_prefix"])
+        for adapter in adapters
+        if adapter["enabled"]
+        for ip_info in adapter["ipv4"]
+    ]
+    hosts = hosts_to_scan(interfaces)
+    if not hosts:
+        return []
+    timeout = min(
+        DISCOVERY_TIMEOUT_PER_SUBNET * len(subnets_to_scan(interfaces)),
+        MAX_DISCOVERY_TIMEOUT,
+    )
+
+    session = async_get_clientsession(hass, verify_ssl=False)
+    semaphore = asyncio.Semaphore(PROBE_CONCURRENCY)
+
+    async def probe(host: str) -> bool:
+        async with semaphore:
+            return await async_probe_router(session, host)
+
+    tasks = {asyncio.create_task(probe(host)): host for host in hosts}
+    done, pending = await asyncio.wait(tasks, timeout=timeout)
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.wait(pending)
+        LOGGER.info(
+            "Router discovery skipped %s of %s hosts after %ss",
+            len(pending), len(hosts), timeout)
+
+    found = [tasks[task] for task in done if task.result()]
+    found.sort(key=ipaddress.IPv4Address)
+    LOGGER.debug("Scanned %s hosts, found WAX204 routers at %s", len(hosts), found)
+    return found
+
+
+async def async_probe_router(session: aiohttp.ClientSession, host: str) -> bool:
+    """Check if host is a WAX204 router. Never raises on connection errors."""
+    try:
+        async with asyncio.timeout(PROBE_TIMEOUT):
+            return await probe_wax_router(session, f"https://{host}")
+    except (aiohttp.ClientError, TimeoutError, UnicodeDecodeError):
+        return False
+
+
+def subnets_to_scan(
+    interfaces: Iterable[tuple[str, int]]
+) -> list[ipaddress.IPv4Network]:
+    """Return the subnets to scan for the given (address, prefix) interfaces."""
+    subnets: dict[ipaddress.IPv4Network, None] = {}
+    for address, prefix in interfaces:
+        ip = ipaddress.IPv4Address(address)
+        if ip.is_loopback or ip.is_link_local:
+            continue
+        subnet = ipaddress.IPv4Network(
+            f"{address}/{max(prefix, MIN_PREFIX)}", strict=False)
+        subnets[subnet] = None
+    return list(subnets)
+
+
+def hosts_to_scan(interfaces: Iterable[tuple[str, int]]) -> list[str]:
+    """Return the hosts to probe for the given (address, prefix) interfaces.
+
+    The first and last host of every subnet come first, since that's where
+    routers usually are, so they are probed before discovery runs out of time.
+    """
+    interfaces = list(interfaces)
+    own_addresses = {address for address, _ in interfaces}
+    gateways: dict[str, None] = {}
+    hosts: dict[str, None] = {}
+    for subnet in subnets_to_scan(interfaces):
+        subnet_hosts = [str(host) for host in subnet.hosts()]
+        gateways[subnet_hosts[0]] = None
+        gateways[subnet_hosts[-1]] = None
+        for host in subnet_hosts:
+            hosts[host] = None
+
+    return [
+        host
+        for host in [*gateways, *(h for h in hosts if h not in gateways)]
+        if host not in own_addresses
+    ]
@@ -0,0 +1,167 @@
+"""On-demand profiling of coordinator update cycles."""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+import cProfile
+from datetime import datetime
+import pstats
+import time
+
+import orjson
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, LOGGER
+
+STAGE_HTTP = "http"
+STAGE_PARSE = "parse"
+STAGE_MODEL = "model"
+STAGE_DISPATCH = "dispatch"
+
+
+class CoordinatorProfiler:
+    """Profile the next few update cycles of one or more coordinators.
+
+    cProfile is only enabled while a cycle is running, from the start of
+    `_async_update_data` until the listeners have been notified. Since the
+    profiler runs on the event loop thread, anything else the loop runs while
+    a cycle is waiting on the router is captured as well.
+
+    Stage timings are wall clock milliseconds. The `http` stage includes time
+    spent awaiting the router, the other stages run synchronously and block the
+    event loop for their whole duration.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        cycles: int,
+        on_finished: Callable[[], None] | None = None,
+    ) -> None:
+        self.hass = hass
+        self.cycles = cycles
+        self._on_finished = on_finished
+        self._profile = cProfile.Profile()
+        self._active_cycles = 0
+        self._remaining: dict[str, int] = {}
+        self._current: dict[str, dict[str, float]] = {}
+        self._fetched: set[str] = set()
+        self._timings: dict[str, list[dict[str, float]]] = {}
+        self._started = datetime.now()
+        # Whether cProfile is enabled right now, and whether it ever was
+        self._enabled = False
+        self._profiled = False
+        self._done = False
+
+    def add_source(self, key: str) -> None:
+        """Profile the next cycles of the coordinator identified by key."""
+        self._remaining[key] = self.cycles
+        self._timings[key] = []
+
+    def start_cycle(self, key: str) -> None:
+        if key in self._current:
+            # The previous cycle never dispatched to listeners (failed update)
+            self._finish_cycle(key)
+        if self._remaining.get(key, 0) <= 0:
+            return
+        self._current[key] = {}
+        self._active_cycles += 1
+        if self._active_cycles == 1:
+            self._enable()
+
+    @contextmanager
+    def stage(self, key: str, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            current = self._current.get(key)
+            if current is not None:
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                current[name] = current.get(name, 0.0) + elapsed_ms
+
+    def fetch_done(self, key: str) -> None:
+        """Mark that the data of the current cycle was fetched and built."""
+        if key in self._current:
+            self._fetched.add(key)
+
+    def end_cycle(self, key: str) -> None:
+        """End the current cycle once its listeners have been notified."""
+        if key in self._fetched:
+            self._finish_cycle(key)
+
+    def remove_source(self, key: str) -> None:
+        """Stop profiling the coordinator identified by key, e.g. on unload."""
+        if self._current.pop(key, None) is not None:
+            self._deactivate_cycle()
+        self._fetched.discard(key)
+        self._remaining.pop(key, None)
+        self._check_finished()
+
+    @property
+    def finished(self) -> bool:
+        return all(remaining <= 0 for remaining in self._remaining.values())
+
+    def _enable(self) -> None:
+        try:
+            self._profile.enable()
+        except ValueError:
+            # Python 3.12+ only allows one profiler at a time, e.g. the profiler integration
+            LOGGER.warning(
+                "Another profiler is already running. Only recording stage timings")
+            return
+        self._enabled = True
+        self._profiled = True
+
+    def _deactivate_cycle(self) -> None:
+        self._active_cycles -= 1
+        if self._active_cycles == 0 and self._enabled:
+            self._profile.disable()
+            self._enabled = False
+
+    def _finish_cycle(self, key: str) -> None:
+        self._timings[key].append(self._current.pop(key))
+        self._fetched.discard(key)
+        self._remaining[key] -= 1
+        self._deactivate_cycle()
+        self._check_finished()
+
+    def _check_finished(self) -> None:
+        if self._done or not self.finished:
+            return
+        self._done = True
+        self.hass.async_create_task(self._async_write_results())
+
+    async def _async_write_results(self) -> None:
+        base_name = f"{DOMAIN}_profile_{self._started.strftime('%Y%m%d_%H%M%S')}"
+        stats_path = None
+        if self._profiled:
+            stats_path = self.hass.config.path(f"{base_name}.prof")
+        timings_path = self.hass.config.path(f"{base_name}.json")
+        timings = {"cycles": self.cycles, "stage_ms": self._timings}
+
+        try:
+            stats = pstats.Stats(self._profile) if stats_path else None
+            await self.hass.async_add_executor_job(
+                _write_results, stats, stats_path, timings, timings_path)
+            LOGGER.info(
+                "Wrote profile of %s update cycles to %s and stage timings to %s",
+                self.cycles, stats_path, timings_path)
+        except OSError:
+            LOGGER.exception("Failed to write profile results")
+        finally:
+            if self._on_finished is not None:
+                self._on_finished()
+
+
+def _write_results(
+    stats: pstats.Stats | None,
+    stats_path: str | None,
+    timings: dict,
+    timings_path: str,
+) -> None:
+    if stats is not None:
+        stats.dump_stats(stats_path)
+    with open(timings_path, "wb") as f:
+        f.write(orjson.dumps(timings, option=orjson.OPT_INDENT_2))
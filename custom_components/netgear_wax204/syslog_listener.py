@@ -0,0 +1,169 @@
+"""Receive the router's syslog to detect devices joining and leaving."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import contextlib
+from dataclasses import dataclass
+import re
+
+from homeassistant.helpers.device_registry import format_mac
+
+from .const import LOGGER
+
+_MAC = r"(?P<mac>[0-9A-Fa-f]{2}(?::[0-9A-Fa-f]{2}){5})"
+_IP = r"(?P<ip>\d{1,3}(?:\.\d{1,3}){3})"
+
+# Matched with re.search against each log line, checked in order
+_CONNECTED_PATTERNS = [
+    # dnsmasq-dhcp[1234]: DHCPACK(br0) 192.168.1.23 aa:bb:cc:dd:ee:ff phone
+    re.compile(rf"\bDHCPACK\([^)]*\) {_IP} {_MAC}(?: (?P<hostname>[^\s*]\S*))?"),
+    # [DHCP IP: (192.168.1.23)] to MAC address aa:bb:cc:dd:ee:ff
+    re.compile(rf"\[DHCP IP: \({_IP}\)\] to MAC address {_MAC}"),
+    # hostapd: wlan0: STA aa:bb:cc:dd:ee:ff IEEE 802.11: associated
+    re.compile(rf"\bSTA {_MAC} IEEE 802\.11: associated"),
+    # hostapd: wlan0: AP-STA-CONNECTED aa:bb:cc:dd:ee:ff
+    re.compile(rf"\bAP-STA-CONNECTED {_MAC}"),
+]
+_DISCONNECTED_PATTERNS = [
+    re.compile(rf"\bDHCPRELEASE\([^)]*\) {_IP} {_MAC}"),
+    re.compile(rf"\bSTA {_MAC} IEEE 802\.11: disassociated"),
+    re.compile(rf"\bAP-STA-DISCONNECTED {_MAC}"),
+]
+
+
+@dataclass
+class PresenceEvent:
+    """A device connected to or disconnected from the router."""
+
+    mac: str
+    connected: bool
+    ip: str | None = None
+    hostname: str | None = None
+
+
+def parse_syslog_line(line: str) -> PresenceEvent | None:
+    """Parse a syslog line. Returns None if it isn't about device presence."""
+    for pattern in _CONNECTED_PATTERNS:
+        match = pattern.search(line)
+        if match is not None:
+            groups = match.groupdict()
+            return PresenceEvent(
+                mac=format_mac(groups["mac"]),
+                connected=True,
+                ip=groups.get("ip"),
+                hostname=groups.get("hostname"),
+            )
+    for pattern in _DISCONNECTED_PATTERNS:
+        match = pattern.search(line)
+        if match is not None:
+            return PresenceEvent(mac=format_mac(match.group("mac")), connected=False)
+    return None
+
+
+class SyslogServer:
+    """Syslog receiver listening on both UDP and TCP.
+
+    TCP messages must be newline delimited (octet counted framing isn't
+    supported). When allowed_hosts is set, messages from other addresses are
+    ignored.
+    """
+
+    def __init__(
+        self,
+        port: int,
+        on_event: Callable[[PresenceEvent], None],
+        allowed_hosts: set[str] | None = None,
+        bind_host: str = "0.0.0.0",
+    ) -> None:
+        self.port = port
+        self.bind_host = bind_host
+        self.allowed_hosts = allowed_hosts
+        self._on_event = on_event
+        self._transport: asyncio.DatagramTransport | None = None
+        self._server: asyncio.Server | None = None
+        self._clients: set[asyncio.StreamWriter] = set()
+
+    @property
+    def udp_port(self) -> int | None:
+        if self._transport is None:
+            return None
+        return self._transport.get_extra_info("sockname")[1]
+
+    @property
+    def tcp_port(self) -> int | None:
+        if self._server is None:
+            return None
+        return self._server.sockets[0].getsockname()[1]
+
+    async def async_start(self) -> None:
+        """Start listening. Raises OSError if the port can't be bound."""
+        loop = asyncio.get_running_loop()
+        self._transport, _ = await loop.create_datagram_endpoint(
+            lambda: _SyslogDatagramProtocol(self),
+            local_addr=(self.bind_host, self.port),
+        )
+        try:
+            self._server = await asyncio.start_server(
+                self._handle_tcp_client, self.bind_host, self.port)
+        except OSError:
+            await self.async_stop()
+            raise
+        LOGGER.info("Listening for syslog messages on port %s", self.port)
+
+    async def async_stop(self) -> None:
+        """Stop listening and close connected TCP clients."""
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+        server, self._server = self._server, None
+        if server is not None:
+            server.close()
+        clients = list(self._clients)
+        for writer in clients:
+            writer.close()
+        for writer in clients:
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+        if server is not None:
+            await server.wait_closed()
+
+    def _is_allowed(self, addr: tuple) -> bool:
+        return self.allowed_hosts is None or addr[0] in self.allowed_hosts
+
+    def _handle_line(self, line: str) -> None:
+        event = parse_syslog_line(line)
+        if event is None:
+            return
+        LOGGER.debug("Syslog presence event: %s", event)
+        self._on_event(event)
+
+    async def _handle_tcp_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._clients.add(writer)
+        try:
+            if not self._is_allowed(writer.get_extra_info("peername")):
+                return
+            while line := await reader.readline():
+                if self._server is None:
+                    # Stopped while this line was being read
+                    return
+                self._handle_line(line.decode(errors="replace"))
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            LOGGER.debug("Syslog TCP connection failed", exc_info=True)
+        finally:
+            self._clients.discard(writer)
+            writer.close()
+
+
+class _SyslogDatagramProtocol(asyncio.DatagramProtocol):
+    def __init__(self, server: SyslogServer) -> None:
+        self._server = server
+
+    def datagram_received(self, data: bytes, addr: tuple) -> None:
+        if self._server._transport is None or not self._server._is_allowed(addr):
+            return
+        for line in data.decode(errors="replace").splitlines():
+            self._server._handle_line(line)
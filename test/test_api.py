@@ -1,9 +1,13 @@
 import pytest
 import re
+from unittest.mock import AsyncMock, patch
 
 from custom_components.netgear_wax204.api import (
+    ConnectedDevice,
     WAX204Api,
+    WAX204ApiError,
     WAX204ApiInvalidPasswordError,
+    parse_connected_devices,
 )
 from homeassistant.core import HomeAssistant
 
@@ -76,3 +80,37 @@ async def test_all_apis_after_sign_in(hass: HomeAssistant, router_host, router_p
     assert await wax204_api.is_wax_router()
     await wax204_api.sign_out_other_users()
     await wax204_api.get_connected_devices()
+
+
+DEVICES_JSON = """{"devices": [
+    {"deviceName": "phone", "ip": "192.168.1.23", "mac": "aa:bb:cc:dd:ee:01"},
+    {"ip": "192.168.1.24", "mac": "AA:BB:CC:DD:EE:02"}
+]}"""
+
+
+def test_parse_connected_devices() -> None:
+    # Macs are normalized with format_mac
+    assert parse_connected_devices(DEVICES_JSON) == [
+        ConnectedDevice(hostname="phone", ip="192.168.1.23",
+                        mac="aa:bb:cc:dd:ee:01"),
+        ConnectedDevice(hostname=None, ip="192.168.1.24",
+                        mac="aa:bb:cc:dd:ee:02"),
+    ]
+
+
+def test_parse_connected_devices_no_devices() -> None:
+    assert parse_connected_devices("{}") == []
+
+
+def test_parse_connected_devices_invalid_json() -> None:
+    with pytest.raises(WAX204ApiError):
+        parse_connected_devices("<html>not json</html>")
+
+
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_get_connected_devices_parses_fetched_json(hass: HomeAssistant) -> None:
+    wax204_api = WAX204Api(hass, "192.168.1.1")
+    with patch.object(wax204_api, "fetch_connected_devices", AsyncMock(return_value=DEVICES_JSON)):
+        devices = await wax204_api.get_connected_devices()
+
+    assert devices == parse_connected_devices(DEVICES_JSON)
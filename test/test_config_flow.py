@@ -0,0 +1,110 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.netgear_wax204.const import DOMAIN
+from homeassistant import config_entries
+from homeassistant.const import CONF_HOST, CONF_PASSWORD
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+
+PATCH_DISCOVER = "custom_components.netgear_wax204.config_flow.async_discover_routers"
+PATCH_VALIDATE = "custom_components.netgear_wax204.config_flow.validate_input"
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    yield
+
+
+@pytest.fixture(autouse=True)
+def skip_setup_entry():
+    with patch("custom_components.netgear_wax204.async_setup_entry", return_value=True):
+        yield
+
+
+async def start_flow(hass: HomeAssistant) -> dict:
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER})
+    assert result["type"] is FlowResultType.MENU
+    assert result["menu_options"] == ["discovery", "host"]
+    return result
+
+
+async def run_discovery(hass: HomeAssistant, found: list[str]) -> dict:
+    result = await start_flow(hass)
+    with patch(PATCH_DISCOVER, AsyncMock(return_value=found)) as discover:
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {"next_step_id": "discovery"})
+        while result["type"] in (FlowResultType.SHOW_PROGRESS, FlowResultType.SHOW_PROGRESS_DONE):
+            await hass.async_block_till_done()
+            result = await hass.config_entries.flow.async_configure(result["flow_id"])
+    discover.assert_called_once()
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "host"
+    return result
+
+
+def host_field(result: dict):
+    schema = result["data_schema"].schema
+    [key] = [key for key in schema if key == CONF_HOST]
+    return key, schema[key]
+
+
+async def test_discovery_found_routers(hass: HomeAssistant) -> None:
+    result = await run_discovery(hass, ["192.168.1.1", "192.168.2.1"])
+
+    assert result["errors"] == {}
+    key, selector = host_field(result)
+    assert key.default() == "192.168.1.1"
+    assert selector.config["options"] == ["192.168.1.1", "192.168.2.1"]
+
+    with patch(PATCH_VALIDATE, AsyncMock(return_value={"title": "WAX204 Router at 192.168.2.1"})):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {CONF_HOST: "192.168.2.1", CONF_PASSWORD: "hunter2"})
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["data"] == {CONF_HOST: "192.168.2.1", CONF_PASSWORD: "hunter2"}
+
+
+async def test_discovery_no_routers_found(hass: HomeAssistant) -> None:
+    result = await run_discovery(hass, [])
+
+    assert result["errors"] == {"base": "no_routers_found"}
+    key, _ = host_field(result)
+    assert key.default() == "192.168.1.1"
+
+
+async def test_discovery_skips_configured_hosts(hass: HomeAssistant) -> None:
+    MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_HOST: "192.168.1.1", CONF_PASSWORD: "hunter2"},
+    ).add_to_hass(hass)
+
+    result = await run_discovery(hass, ["192.168.1.1", "192.168.2.1"])
+
+    key, selector = host_field(result)
+    assert key.default() == "192.168.2.1"
+    assert selector.config["options"] == ["192.168.2.1"]
+
+
+async def test_manual_host(hass: HomeAssistant) -> None:
+    result = await start_flow(hass)
+
+    with patch(PATCH_DISCOVER, AsyncMock(return_value=[])) as discover:
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {"next_step_id": "host"})
+    discover.assert_not_called()
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "host"
+    assert result["errors"] == {}
+
+    with patch(PATCH_VALIDATE, AsyncMock(return_value={"title": "WAX204 Router at 10.0.0.1"})) as validate:
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {CONF_HOST: "10.0.0.1", CONF_PASSWORD: "hunter2"})
+
+    validate.assert_called_once()
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["title"] == "WAX204 Router at 10.0.0.1"
+    assert result["data"] == {CONF_HOST: "10.0.0.1", CONF_PASSWORD: "hunter2"}
@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from custom_components.netgear_wax204.api import ConnectedDevice
+from custom_components.netgear_wax204.coordinator import (
+    ROAMING_GRACE_PERIOD,
+    Wax204DataModel,
+    Wax204DataUpdateCoordinator,
+)
+from custom_components.netgear_wax204.syslog_listener import (
+    PresenceEvent,
+    parse_syslog_line,
+)
+from homeassistant.core import HomeAssistant
+
+KNOWN = ConnectedDevice(hostname="phone", ip="192.168.1.23", mac="aa:bb:cc:dd:ee:01")
+NEW_MAC = "aa:bb:cc:dd:ee:02"
+
+
+def make_coordinator(hass: HomeAssistant) -> Wax204DataUpdateCoordinator:
+    api = MagicMock()
+    api.host = "https://192.168.1.1"
+    coordinator = Wax204DataUpdateCoordinator(
+        hass,
+        api=api,
+        update_interval=timedelta(seconds=30),
+        cookie_refresh_interval=timedelta(hours=2),
+        consider_home=timedelta(seconds=60),
+        password="hunter2",
+    )
+    coordinator._update_last_seen([KNOWN])
+    coordinator.data = Wax204DataModel(devices=[KNOWN])
+    coordinator.async_request_refresh = AsyncMock()
+    return coordinator
+
+
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_presence_event_disconnect_and_connect(hass: HomeAssistant) -> None:
+    coordinator = make_coordinator(hass)
+    listener = MagicMock()
+    coordinator.async_add_listener(listener)
+
+    coordinator.async_handle_presence_event(
+        PresenceEvent(mac=KNOWN.mac, connected=False))
+    assert not coordinator.is_active(KNOWN.mac)
+
+    coordinator.async_handle_presence_event(
+        PresenceEvent(mac=KNOWN.mac, connected=True))
+    assert coordinator.is_active(KNOWN.mac)
+    assert listener.call_count == 2
+    coordinator.async_request_refresh.assert_not_called()
+
+
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_presence_event_new_device_requests_refresh(hass: HomeAssistant) -> None:
+    coordinator = make_coordinator(hass)
+    listener = MagicMock()
+    coordinator.async_add_listener(listener)
+
+    coordinator.async_handle_presence_event(PresenceEvent(
+        mac=NEW_MAC, connected=True, ip="192.168.1.24"))
+    await hass.async_block_till_done()
+
+    # The poll adds the device with the router's details
+    coordinator.async_request_refresh.assert_called_once()
+    assert NEW_MAC not in coordinator.data.devices
+    assert not coordinator.is_active(NEW_MAC)
+    listener.assert_not_called()
+
+
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_presence_event_unknown_disconnect_ignored(hass: HomeAssistant) -> None:
+    coordinator = make_coordinator(hass)
+    listener = MagicMock()
+    coordinator.async_add_listener(listener)
+
+    coordinator.async_handle_presence_event(
+        PresenceEvent(mac=NEW_MAC, connected=False))
+    await hass.async_block_till_done()
+
+    coordinator.async_request_refresh.assert_not_called()
+    listener.assert_not_called()
+
+
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_presence_event_roaming_between_radios(hass: HomeAssistant) -> None:
+    coordinator = make_coordinator(hass)
+
+    # The new radio logs the association before the old one logs the disassociation
+    for line in [
+        f"<30>Oct 19 10:00:04 WAX204 hostapd: wlan1: AP-STA-CONNECTED {KNOWN.mac}",
+        f"<30>Oct 19 10:00:04 WAX204 hostapd: wlan0: AP-STA-DISCONNECTED {KNOWN.mac}",
+    ]:
+        coordinator.async_handle_presence_event(parse_syslog_line(line))
+
+    assert coordinator.is_active(KNOWN.mac)
+
+
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_presence_event_disconnect_after_grace_period(hass: HomeAssistant) -> None:
+    coordinator = make_coordinator(hass)
+
+    coordinator.async_handle_presence_event(
+        PresenceEvent(mac=KNOWN.mac, connected=True))
+    coordinator._last_connect_event[KNOWN.mac] = (
+        datetime.now() - ROAMING_GRACE_PERIOD - timedelta(seconds=1))
+    coordinator.async_handle_presence_event(
+        PresenceEvent(mac=KNOWN.mac, connected=False))
+
+    assert not coordinator.is_active(KNOWN.mac)
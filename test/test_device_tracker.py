@@ -0,0 +1,151 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from custom_components.netgear_wax204 import device_tracker
+from custom_components.netgear_wax204.api import ConnectedDevice
+from custom_components.netgear_wax204.const import (
+    CONF_REGISTRATION_BATCH_SIZE,
+    DOMAIN,
+)
+from homeassistant.core import HomeAssistant
+
+ENTRY_ID = "entry"
+
+
+def make_device(i: int) -> ConnectedDevice:
+    return ConnectedDevice(hostname=f"device{i}", ip=f"192.168.1.{i}", mac=f"aa:bb:cc:dd:ee:{i:02x}")
+
+
+class FakeTimers:
+    """Replaces async_call_later, timers only run when fired."""
+
+    def __init__(self) -> None:
+        self.active = []
+
+    def __call__(self, hass, delay, action):
+        timer = SimpleNamespace(action=action)
+        self.active.append(timer)
+        return lambda: self.active.remove(timer)
+
+    def fire(self) -> None:
+        timers, self.active = self.active, []
+        for timer in timers:
+            timer.action(None)
+
+
+class Tracker:
+    def __init__(self, hass: HomeAssistant, devices: list[ConnectedDevice] | None, batch_size: int) -> None:
+        self.hass = hass
+        self.timers = FakeTimers()
+        self.listeners = []
+        self.unload_callbacks = []
+        self.add_entities = MagicMock()
+
+        self.coordinator = MagicMock()
+        self.coordinator.data = None if devices is None else SimpleNamespace(devices={})
+        self.coordinator.joined_macs = set()
+        self.coordinator.async_add_listener.side_effect = self._add_listener
+        if devices:
+            self.coordinator.data.devices = {d.mac: d for d in devices}
+
+        self.entry = MagicMock()
+        self.entry.entry_id = ENTRY_ID
+        self.entry.options = {CONF_REGISTRATION_BATCH_SIZE: batch_size}
+        self.entry.async_on_unload.side_effect = self.unload_callbacks.append
+
+    def _add_listener(self, listener):
+        self.listeners.append(listener)
+        return lambda: self.listeners.remove(listener)
+
+    async def setup(self) -> None:
+        self.hass.data[DOMAIN] = {ENTRY_ID: {"coordinator": self.coordinator}}
+        with patch.object(device_tracker, "async_call_later", self.timers):
+            await device_tracker.async_setup_entry(self.hass, self.entry, self.add_entities)
+
+    def update(self, devices: list[ConnectedDevice], joined: list[ConnectedDevice]) -> None:
+        self.coordinator.data.devices = {d.mac: d for d in devices}
+        self.coordinator.joined_macs = {d.mac for d in joined}
+        with patch.object(device_tracker, "async_call_later", self.timers):
+            for listener in self.listeners:
+                listener()
+
+    def fire(self) -> None:
+        with patch.object(device_tracker, "async_call_later", self.timers):
+            self.timers.fire()
+
+    def added_macs(self) -> list[list[str]]:
+        return [[e.unique_id for e in call.args[0]] for call in self.add_entities.call_args_list]
+
+
+async def test_initial_devices_added_in_batches(hass: HomeAssistant) -> None:
+    devices = [make_device(i) for i in range(1, 6)]
+    tracker = Tracker(hass, devices, batch_size=2)
+    await tracker.setup()
+    tracker.add_entities.assert_not_called()
+
+    for _ in range(3):
+        tracker.fire()
+
+    assert tracker.added_macs() == [
+        [devices[0].mac, devices[1].mac],
+        [devices[2].mac, devices[3].mac],
+        [devices[4].mac],
+    ]
+    assert tracker.timers.active == []
+
+
+async def test_only_joined_devices_are_added(hass: HomeAssistant) -> None:
+    devices = [make_device(i) for i in range(1, 4)]
+    tracker = Tracker(hass, devices[:1], batch_size=10)
+    await tracker.setup()
+    tracker.fire()
+
+    new_device = make_device(10)
+    # devices[1] is in the poll but wasn't announced as a join, it isn't scanned for
+    tracker.update(devices + [new_device], joined=[new_device])
+    tracker.fire()
+
+    assert tracker.added_macs() == [[devices[0].mac], [new_device.mac]]
+
+
+async def test_no_empty_add(hass: HomeAssistant) -> None:
+    device = make_device(1)
+    tracker = Tracker(hass, None, batch_size=10)
+    await tracker.setup()
+
+    tracker.coordinator.data = SimpleNamespace(devices={})
+    tracker.update([device], joined=[])
+    tracker.fire()
+    tracker.update([device], joined=[device])
+    tracker.fire()
+    # Already registered devices that join again aren't queued
+    tracker.update([device], joined=[device])
+    tracker.fire()
+
+    assert tracker.added_macs() == [[device.mac]]
+
+
+async def test_timer_restarts_while_devices_arrive(hass: HomeAssistant) -> None:
+    first, second = make_device(1), make_device(2)
+    tracker = Tracker(hass, None, batch_size=10)
+    await tracker.setup()
+    tracker.coordinator.data = SimpleNamespace(devices={})
+
+    tracker.update([first], joined=[first])
+    tracker.update([first, second], joined=[second])
+    assert len(tracker.timers.active) == 1
+
+    tracker.fire()
+    assert tracker.added_macs() == [[first.mac, second.mac]]
+
+
+async def test_unload_cancels_pending_registration(hass: HomeAssistant) -> None:
+    tracker = Tracker(hass, [make_device(1)], batch_size=10)
+    await tracker.setup()
+    assert len(tracker.timers.active) == 1
+
+    for unload in tracker.unload_callbacks:
+        unload()
+
+    assert tracker.timers.active == []
+    tracker.add_entities.assert_not_called()
@@ -0,0 +1,146 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from custom_components.netgear_wax204 import discovery
+from custom_components.netgear_wax204.discovery import (
+    PROBE_CONCURRENCY,
+    async_discover_routers,
+    hosts_to_scan,
+)
+
+ADAPTERS = [
+    {
+        "enabled": True,
+        "ipv4": [{"address": "192.168.1.20", "network_prefix": 24}],
+    },
+    {
+        "enabled": False,
+        "ipv4": [{"address": "10.0.0.5", "network_prefix": 24}],
+    },
+]
+
+
+def patch_discovery(probe):
+    return (
+        patch.object(discovery.network, "async_get_adapters",
+                     AsyncMock(return_value=ADAPTERS)),
+        patch.object(discovery, "async_get_clientsession", MagicMock()),
+        patch.object(discovery, "async_probe_router", probe),
+    )
+
+
+def test_hosts_to_scan_slash_24() -> None:
+    hosts = hosts_to_scan([("192.168.1.20", 24)])
+
+    assert len(hosts) == 253
+    # Likely gateway addresses first
+    assert hosts[:3] == ["192.168.1.1", "192.168.1.254", "192.168.1.2"]
+    assert hosts[-1] == "192.168.1.253"
+    assert "192.168.1.20" not in hosts
+
+
+def test_hosts_to_scan_limits_large_subnets() -> None:
+    hosts = hosts_to_scan([("10.0.5.7", 16)])
+
+    assert len(hosts) == 253
+    assert all(host.startswith("10.0.5.") for host in hosts)
+
+
+def test_hosts_to_scan_skips_loopback_and_duplicates() -> None:
+    hosts = hosts_to_scan([
+        ("127.0.0.1", 8),
+        ("192.168.1.20", 24),
+        ("192.168.1.21", 24),
+    ])
+
+    assert len(hosts) == 252
+    assert len(set(hosts)) == len(hosts)
+
+
+def test_hosts_to_scan_gateways_of_every_subnet_first() -> None:
+    hosts = hosts_to_scan([
+        ("192.168.1.20", 24),
+        ("192.168.2.20", 24),
+        ("192.168.3.20", 24),
+    ])
+
+    assert hosts[:6] == [
+        "192.168.1.1", "192.168.1.254",
+        "192.168.2.1", "192.168.2.254",
+        "192.168.3.1", "192.168.3.254",
+    ]
+
+
+async def test_discover_routers_bounded_concurrency() -> None:
+    in_flight = 0
+    max_in_flight = 0
+    probed = []
+
+    async def probe(session, host: str) -> bool:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        probed.append(host)
+        return host in ("192.168.1.1", "192.168.1.100")
+
+    adapters, session, probe_router = patch_discovery(probe)
+    with adapters, session, probe_router:
+        found = await async_discover_routers(MagicMock())
+
+    assert found == ["192.168.1.1", "192.168.1.100"]
+    assert max_in_flight == PROBE_CONCURRENCY
+    assert len(probed) == 253
+    assert all(host.startswith("192.168.1.") for host in probed)
+
+
+async def test_discover_routers_cancels_probes_at_deadline() -> None:
+    cancelled = []
+
+    async def probe(session, host: str) -> bool:
+        if host == "192.168.1.1":
+            return True
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.append(host)
+            raise
+        return True
+
+    adapters, session, probe_router = patch_discovery(probe)
+    with adapters, session, probe_router, patch.object(discovery, "DISCOVERY_TIMEOUT_PER_SUBNET", 0.1):
+        found = await asyncio.wait_for(async_discover_routers(MagicMock()), 5)
+
+    assert found == ["192.168.1.1"]
+    # Probes that were running when the deadline hit were cancelled
+    assert len(cancelled) == PROBE_CONCURRENCY
+
+
+async def test_discover_routers_probes_gateways_before_deadline() -> None:
+    adapters = [
+        {
+            "enabled": True,
+            "ipv4": [{"address": f"192.168.{i}.20", "network_prefix": 24}],
+        }
+        for i in range(1, 5)
+    ]
+
+    async def probe(session, host: str) -> bool:
+        if host == "192.168.4.254":
+            return True
+        await asyncio.sleep(60)
+        return False
+
+    _, session, probe_router = patch_discovery(probe)
+    with (
+        patch.object(discovery.network, "async_get_adapters",
+                     AsyncMock(return_value=adapters)),
+        session,
+        probe_router,
+        patch.object(discovery, "DISCOVERY_TIMEOUT_PER_SUBNET", 0.05),
+    ):
+        found = await asyncio.wait_for(async_discover_routers(MagicMock()), 5)
+
+    # The last subnet's gateway was probed although most hosts were skipped
+    assert found == ["192.168.4.254"]
@@ -0,0 +1,47 @@
+import socket
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.netgear_wax204 import _async_resolve_host, async_unload_entry
+from custom_components.netgear_wax204.const import DOMAIN
+from homeassistant.core import HomeAssistant
+
+
+async def test_resolve_host_ip_address(hass: HomeAssistant) -> None:
+    with patch.object(hass.loop, "getaddrinfo", AsyncMock()) as getaddrinfo:
+        assert await _async_resolve_host(hass, "192.168.1.1") == {"192.168.1.1"}
+    getaddrinfo.assert_not_called()
+
+
+async def test_resolve_host_dns_name(hass: HomeAssistant) -> None:
+    infos = [
+        (socket.AF_INET, socket.SOCK_DGRAM, 17, "", ("192.168.1.1", 0)),
+        (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("192.168.1.1", 0)),
+        (socket.AF_INET6, socket.SOCK_DGRAM, 17, "", ("fd00::1", 0, 0, 0)),
+    ]
+    with patch.object(hass.loop, "getaddrinfo", AsyncMock(return_value=infos)):
+        assert await _async_resolve_host(hass, "router.lan") == {"192.168.1.1", "fd00::1"}
+
+
+async def test_unload_stops_syslog_server(hass: HomeAssistant) -> None:
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+    server = MagicMock()
+    server.async_stop = AsyncMock()
+    coordinator = MagicMock()
+    coordinator.profiler = None
+    hass.data[DOMAIN] = {
+        entry.entry_id: {
+            "api": MagicMock(),
+            "update_listener": MagicMock(),
+            "coordinator": coordinator,
+            "syslog_server": server,
+        }
+    }
+
+    with patch.object(hass.config_entries, "async_unload_platforms", AsyncMock(return_value=True)):
+        assert await async_unload_entry(hass, entry)
+
+    server.async_stop.assert_awaited_once()
+    assert hass.data[DOMAIN] == {}
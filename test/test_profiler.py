@@ -0,0 +1,154 @@
+import cProfile
+from unittest.mock import MagicMock
+
+import orjson
+
+from custom_components.netgear_wax204.profiler import (
+    STAGE_DISPATCH,
+    STAGE_HTTP,
+    CoordinatorProfiler,
+)
+
+HOST = "https://192.168.1.1"
+OTHER_HOST = "https://192.168.2.1"
+
+
+def mock_hass(tmp_path=None) -> MagicMock:
+    hass = MagicMock()
+    if tmp_path is not None:
+        hass.config.path = lambda name: str(tmp_path / name)
+
+    async def async_add_executor_job(target, *args):
+        return target(*args)
+
+    hass.async_add_executor_job = async_add_executor_job
+    return hass
+
+
+def run_cycle(profiler: CoordinatorProfiler, key: str = HOST) -> None:
+    profiler.start_cycle(key)
+    with profiler.stage(key, STAGE_HTTP):
+        pass
+    profiler.fetch_done(key)
+    with profiler.stage(key, STAGE_DISPATCH):
+        pass
+    profiler.end_cycle(key)
+
+
+def scheduled_write(hass: MagicMock):
+    assert hass.async_create_task.call_count == 1
+    return hass.async_create_task.call_args[0][0]
+
+
+def test_write_scheduled_once_after_cycles() -> None:
+    hass = mock_hass()
+    profiler = CoordinatorProfiler(hass, 2)
+    profiler.add_source(HOST)
+
+    run_cycle(profiler)
+    assert not profiler.finished
+    hass.async_create_task.assert_not_called()
+
+    run_cycle(profiler)
+    assert profiler.finished
+    scheduled_write(hass).close()
+
+    # Further cycles aren't recorded and don't schedule another write
+    run_cycle(profiler)
+    assert hass.async_create_task.call_count == 1
+    assert len(profiler._timings[HOST]) == 2
+
+
+def test_cycle_ends_only_after_fetch() -> None:
+    hass = mock_hass()
+    profiler = CoordinatorProfiler(hass, 1)
+    profiler.add_source(HOST)
+
+    profiler.start_cycle(HOST)
+    # Listeners updated by something else while the cycle is still fetching
+    profiler.end_cycle(HOST)
+    assert not profiler.finished
+
+    profiler.fetch_done(HOST)
+    profiler.end_cycle(HOST)
+    assert profiler.finished
+    scheduled_write(hass).close()
+
+
+def test_failed_cycle_is_finished_by_next_cycle() -> None:
+    hass = mock_hass()
+    profiler = CoordinatorProfiler(hass, 2)
+    profiler.add_source(HOST)
+
+    # Failed update, listeners were never notified
+    profiler.start_cycle(HOST)
+    profiler.fetch_done(HOST)
+
+    run_cycle(profiler)
+    assert profiler.finished
+    assert profiler._active_cycles == 0
+    assert len(profiler._timings[HOST]) == 2
+    scheduled_write(hass).close()
+
+
+def test_remove_source_finishes_remaining_sources() -> None:
+    hass = mock_hass()
+    on_finished = MagicMock()
+    profiler = CoordinatorProfiler(hass, 1, on_finished=on_finished)
+    profiler.add_source(HOST)
+    profiler.add_source(OTHER_HOST)
+
+    run_cycle(profiler, HOST)
+    profiler.start_cycle(OTHER_HOST)
+    hass.async_create_task.assert_not_called()
+
+    profiler.remove_source(OTHER_HOST)
+    assert profiler._active_cycles == 0
+    scheduled_write(hass).close()
+
+
+async def test_write_results(tmp_path) -> None:
+    hass = mock_hass(tmp_path)
+    on_finished = MagicMock()
+    profiler = CoordinatorProfiler(hass, 1, on_finished=on_finished)
+    profiler.add_source(HOST)
+
+    run_cycle(profiler)
+    await scheduled_write(hass)
+
+    [stats_file] = tmp_path.glob("*.prof")
+    [timings_file] = tmp_path.glob("*.json")
+    assert stats_file.stat().st_size > 0
+    timings = orjson.loads(timings_file.read_bytes())
+    assert timings["cycles"] == 1
+    assert set(timings["stage_ms"][HOST][0]) == {STAGE_HTTP, STAGE_DISPATCH}
+    on_finished.assert_called_once()
+
+
+async def test_write_failure_still_finishes(tmp_path) -> None:
+    hass = mock_hass(tmp_path / "missing")
+    on_finished = MagicMock()
+    profiler = CoordinatorProfiler(hass, 1, on_finished=on_finished)
+    profiler.add_source(HOST)
+
+    run_cycle(profiler)
+    await scheduled_write(hass)
+
+    on_finished.assert_called_once()
+
+
+async def test_other_profiler_active(tmp_path) -> None:
+    hass = mock_hass(tmp_path)
+    profiler = CoordinatorProfiler(hass, 1)
+    profiler.add_source(HOST)
+    profiler._profile = MagicMock(spec=cProfile.Profile)
+    profiler._profile.enable.side_effect = ValueError(
+        "Another profiling tool is already active")
+
+    run_cycle(profiler)
+    await scheduled_write(hass)
+
+    assert profiler._active_cycles == 0
+    profiler._profile.disable.assert_not_called()
+    assert list(tmp_path.glob("*.prof")) == []
+    assert len(list(tmp_path.glob("*.json"))) == 1
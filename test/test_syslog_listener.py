@@ -0,0 +1,122 @@
+import asyncio
+import socket
+
+from custom_components.netgear_wax204.syslog_listener import (
+    PresenceEvent,
+    SyslogServer,
+    parse_syslog_line,
+)
+
+# Captured router log lines
+CAPTURED_LINES = [
+    "<30>Oct 19 10:00:01 WAX204 dnsmasq-dhcp[1234]: DHCPACK(br0) 192.168.1.23 aa:bb:cc:dd:ee:01 phone",
+    "<30>Oct 19 10:00:02 WAX204 dnsmasq-dhcp[1234]: DHCPACK(br0) 192.168.1.24 aa:bb:cc:dd:ee:02 *",
+    "<134>Oct 19 10:00:03 WAX204 [DHCP IP: (192.168.1.25)] to MAC address AA:BB:CC:DD:EE:03, Sunday, Oct 19,2026 10:00:03",
+    "<30>Oct 19 10:00:04 WAX204 hostapd: wlan0: STA aa:bb:cc:dd:ee:04 IEEE 802.11: associated",
+    "<30>Oct 19 10:00:05 WAX204 hostapd: wlan1: AP-STA-CONNECTED aa:bb:cc:dd:ee:05",
+    "<30>Oct 19 10:00:06 WAX204 hostapd: wlan0: STA aa:bb:cc:dd:ee:04 IEEE 802.11: disassociated",
+    "<30>Oct 19 10:00:07 WAX204 hostapd: wlan1: AP-STA-DISCONNECTED aa:bb:cc:dd:ee:05",
+    "<30>Oct 19 10:00:08 WAX204 dnsmasq-dhcp[1234]: DHCPRELEASE(br0) 192.168.1.23 aa:bb:cc:dd:ee:01",
+    "<30>Oct 19 10:00:09 WAX204 hostapd: wlan0: STA aa:bb:cc:dd:ee:04 WPA: pairwise key handshake completed (RSN)",
+    "<30>Oct 19 10:00:10 WAX204 dnsmasq-dhcp[1234]: DHCPREQUEST(br0) 192.168.1.23 aa:bb:cc:dd:ee:01",
+]
+
+EXPECTED_EVENTS = [
+    PresenceEvent(mac="aa:bb:cc:dd:ee:01", connected=True,
+                  ip="192.168.1.23", hostname="phone"),
+    PresenceEvent(mac="aa:bb:cc:dd:ee:02", connected=True,
+                  ip="192.168.1.24", hostname=None),
+    # Macs are normalized with format_mac
+    PresenceEvent(mac="aa:bb:cc:dd:ee:03", connected=True, ip="192.168.1.25"),
+    PresenceEvent(mac="aa:bb:cc:dd:ee:04", connected=True),
+    PresenceEvent(mac="aa:bb:cc:dd:ee:05", connected=True),
+    PresenceEvent(mac="aa:bb:cc:dd:ee:04", connected=False),
+    PresenceEvent(mac="aa:bb:cc:dd:ee:05", connected=False),
+    PresenceEvent(mac="aa:bb:cc:dd:ee:01", connected=False),
+]
+
+
+def test_parse_syslog_lines() -> None:
+    events = [parse_syslog_line(line) for line in CAPTURED_LINES]
+
+    assert [e for e in events if e is not None] == EXPECTED_EVENTS
+    assert events[-2:] == [None, None]
+
+
+async def _replay(server: SyslogServer, events: list[PresenceEvent], send) -> None:
+    await server.async_start()
+    try:
+        await send()
+        for _ in range(100):
+            if len(events) == len(EXPECTED_EVENTS):
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await server.async_stop()
+
+
+async def test_syslog_server_udp() -> None:
+    events = []
+    server = SyslogServer(0, events.append, bind_host="127.0.0.1")
+
+    async def send() -> None:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            for line in CAPTURED_LINES:
+                s.sendto(line.encode(), ("127.0.0.1", server.udp_port))
+
+    await _replay(server, events, send)
+
+    assert events == EXPECTED_EVENTS
+
+
+async def test_syslog_server_tcp() -> None:
+    events = []
+    server = SyslogServer(0, events.append, bind_host="127.0.0.1")
+
+    async def send() -> None:
+        _, writer = await asyncio.open_connection("127.0.0.1", server.tcp_port)
+        writer.write("".join(f"{line}\n" for line in CAPTURED_LINES).encode())
+        await writer.drain()
+        writer.close()
+        await writer.wait_closed()
+
+    await _replay(server, events, send)
+
+    assert events == EXPECTED_EVENTS
+
+
+async def test_syslog_server_ignores_other_hosts() -> None:
+    events = []
+    server = SyslogServer(0, events.append,
+                          allowed_hosts={"192.168.1.1"}, bind_host="127.0.0.1")
+    await server.async_start()
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.sendto(CAPTURED_LINES[0].encode(), ("127.0.0.1", server.udp_port))
+        await asyncio.sleep(0.05)
+    finally:
+        await server.async_stop()
+
+    assert events == []
+
+
+async def test_syslog_server_stop_closes_tcp_clients() -> None:
+    events = []
+    server = SyslogServer(0, events.append, bind_host="127.0.0.1")
+    await server.async_start()
+    reader, writer = await asyncio.open_connection("127.0.0.1", server.tcp_port)
+    try:
+        writer.write(f"{CAPTURED_LINES[0]}\n".encode())
+        await writer.drain()
+        for _ in range(100):
+            if events:
+                break
+            await asyncio.sleep(0.01)
+
+        await asyncio.wait_for(server.async_stop(), 5)
+
+        # The server closed the connection
+        assert await asyncio.wait_for(reader.read(), 5) == b""
+        assert events == EXPECTED_EVENTS[:1]
+    finally:
+        writer.close()